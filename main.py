@@ -28,7 +28,7 @@ logger = logging.getLogger(__name__)
 from scraper.dormitory_scraper import scrape_dormitory_page
 from scraper.dormitory_calendar_scraper import scrape_dormitory_calendar_page
 from scraper.classes_scraper import scrape_classes_page
-from scraper.pdf_downloader import download_pdf, check_pdf_updated, get_file_hash
+from scraper.pdf_downloader import download_pdf_with_hash, check_pdf_updated
 from scraper.image_downloader import check_image_updated, get_file_hash as get_image_hash
 from processors.classes_processor import process_classes_pdf
 from processors.meals_processor import process_meals_pdf
@@ -122,7 +122,8 @@ def process_dormitory_meals(
             # 一時DLしてハッシュチェック
             logger.debug(f"{label} のPDFを一時ダウンロードしてハッシュを確認中...")
             temp_path = pdf_path.with_suffix(".tmp")
-            if not download_pdf(pdf_url, temp_path):
+            downloaded, pdf_hash = download_pdf_with_hash(pdf_url, temp_path)
+            if not downloaded:
                 logger.warning(f"{label} のPDFの一時ダウンロードに失敗しました。フォールバックとして既存の更新チェックを使用します。")
                 # フォールバック: 既存の更新チェックを使用
                 is_updated, _ = check_pdf_updated(pdf_url, pdf_path)
@@ -133,7 +134,8 @@ def process_dormitory_meals(
                     continue
                 
                 logger.info(f"{label} のPDFをダウンロード中...")
-                if not download_pdf(pdf_url, pdf_path):
+                downloaded, pdf_hash = download_pdf_with_hash(pdf_url, pdf_path)
+                if not downloaded:
                     error_message = f"{label} のPDFのダウンロードに失敗しました。"
                     logger.error(error_message)
                     logger.info("had error is true")
@@ -142,8 +144,7 @@ def process_dormitory_meals(
                         notify_error(discord_webhook, "meals", error_message, {"PDF": pdf_url})
                     continue
             else:
-                # ハッシュを計算
-                pdf_hash = get_file_hash(temp_path)
+                # ダウンロード時に計算したハッシュで処理済みかを確認
                 if pdf_hash:
                     if pdf_hash in processed_hashes:
                         logger.info(f"{label} のPDFは既に処理済みです（ハッシュ: {pdf_hash[:16]}...）。スキップします。")
@@ -166,7 +167,8 @@ def process_dormitory_meals(
                         continue
                     
                     logger.info(f"{label} のPDFをダウンロード中...")
-                    if not download_pdf(pdf_url, pdf_path):
+                    downloaded, pdf_hash = download_pdf_with_hash(pdf_url, pdf_path)
+                    if not downloaded:
                         error_message = f"{label} のPDFのダウンロードに失敗しました。"
                         logger.error(error_message)
                         logger.info("had error is true")  
@@ -191,8 +193,7 @@ def process_dormitory_meals(
             
             if success:
                 logger.info(f"{label} の寮食PDF処理が完了しました。")
-                # ハッシュを収集
-                pdf_hash = get_file_hash(pdf_path)
+                # ハッシュを収集（ダウンロード時に計算済み）
                 if pdf_hash:
                     collected_hashes.append(pdf_hash)
                     logger.debug(f"{label} のハッシュを収集しました: {pdf_hash[:16]}...")
@@ -288,7 +289,8 @@ def process_classes(
         # 一時DLしてハッシュチェック
         logger.debug("PDFを一時ダウンロードしてハッシュを確認中...")
         temp_path = pdf_path.with_suffix(".tmp")
-        if not download_pdf(pdf_url, temp_path):
+        downloaded, pdf_hash = download_pdf_with_hash(pdf_url, temp_path)
+        if not downloaded:
             logger.warning("PDFの一時ダウンロードに失敗しました。フォールバックとして既存の更新チェックを使用します。")
             # フォールバック: 既存の更新チェックを使用
             is_updated, _ = check_pdf_updated(pdf_url, pdf_path)
@@ -299,14 +301,14 @@ def process_classes(
                 return True, None, False
             
             logger.info("PDFをダウンロード中...")
-            if not download_pdf(pdf_url, pdf_path):
+            downloaded, pdf_hash = download_pdf_with_hash(pdf_url, pdf_path)
+            if not downloaded:
                 logger.error("PDFのダウンロードに失敗しました。")
                 if discord_webhook:
                     notify_error(discord_webhook, "classes", "PDFのダウンロードに失敗しました。")
                 return False, None, False
         else:
-            # ハッシュを計算
-            pdf_hash = get_file_hash(temp_path)
+            # ダウンロード時に計算したハッシュで処理済みかを確認
             if pdf_hash:
                 if pdf_hash in processed_hashes:
                     logger.info(f"PDFは既に処理済みです（ハッシュ: {pdf_hash[:16]}...）。スキップします。")
@@ -330,7 +332,8 @@ def process_classes(
                     return True, None, False
                 
                 logger.info("PDFをダウンロード中...")
-                if not download_pdf(pdf_url, pdf_path):
+                downloaded, pdf_hash = download_pdf_with_hash(pdf_url, pdf_path)
+                if not downloaded:
                     logger.error("PDFのダウンロードに失敗しました。")
                     if discord_webhook:
                         notify_error(discord_webhook, "classes", "PDFのダウンロードに失敗しました。")
@@ -352,8 +355,7 @@ def process_classes(
         
         if success:
             logger.info("授業PDF処理が完了しました。")
-            # ハッシュを収集
-            pdf_hash = get_file_hash(pdf_path)
+            # ハッシュはダウンロード時に計算済み
             if discord_webhook:
                 notify_success(
                     discord_webhook,
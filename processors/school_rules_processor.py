@@ -8,15 +8,17 @@ import json
 import logging
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 from common.api_client import OpenRouterCaller, call_gemini_multimodal
 from common.image_utils import render_pdf_pages
 from common.ocr_utils import YomitokuOCR
-from scraper.pdf_downloader import download_pdf, get_file_hash
+from scraper.pdf_downloader import download_pdfs
 from scraper.school_rules_scraper import RULES_URL, scrape_rules_page
 
 logger = logging.getLogger(__name__)
@@ -27,6 +29,8 @@ JSON_BLOCK_RE = re.compile(
     re.DOTALL,
 )
 CONTROL_CHAR_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+RULE_WRITE_WORKERS = 8
+RULE_ORDER_STRIDE = 100000
 
 RULES_SCHEMA = {
     "type": "object",
@@ -568,6 +572,30 @@ def build_rule_items(
     return rule_items, chapters_acc, all_rule_ids
 
 
+def _dump_json_bytes(payload: Any) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """Write data with unbuffered writes so large payloads go out in one syscall."""
+    with open(path, "wb", buffering=0) as f:
+        view = memoryview(data)
+        while view:
+            view = view[f.write(view) :]
+
+
+def _write_json_if_changed(path: Path, payload: Any) -> bool:
+    """Write payload as JSON unless the file already holds identical bytes."""
+    data = _dump_json_bytes(payload)
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    _write_bytes(path, data)
+    return True
+
+
 def render_pdf_to_markdown(
     pdf_path: Path,
     markdown_dir: Path,
@@ -762,11 +790,28 @@ def process_school_rules(
     failed_rule_ids: List[str] = []
 
     rules_meta: List[Dict[str, Any]] = []
+    pending_writes: List[Tuple[Path, Dict[str, Any]]] = []
 
-    for rule in rule_items:
+    # Rules whose PDF URL changed need their content regenerated; fetch all of
+    # those PDFs up front so the network round-trips overlap. Results are keyed
+    # by position because two items can resolve to the same rule id.
+    pending_downloads: Dict[int, Tuple[str, Path]] = {}
+    for index, rule in enumerate(rule_items):
+        existing_meta = existing_rules_by_id.get(rule.rule_id)
+        existing_pdf_url = existing_meta.get("pdfUrl") if existing_meta else None
+        if rule.pdf_url and existing_pdf_url != rule.pdf_url:
+            pending_downloads[index] = (rule.pdf_url, downloads_dir / f"{rule.rule_id}-{index}.tmp")
+    download_results: Dict[int, Tuple[bool, Optional[str], Path]] = {
+        index: (downloaded, pdf_hash, temp_path)
+        for (index, (_, temp_path)), (downloaded, pdf_hash) in zip(
+            pending_downloads.items(), download_pdfs(list(pending_downloads.values()))
+        )
+    }
+
+    for index, rule in enumerate(rule_items):
         existing_meta = existing_rules_by_id.get(rule.rule_id)
-        existing_detail = load_existing_rule_detail(server_repo_path, rule.rule_id)
         existing_pdf_url = existing_meta.get("pdfUrl") if existing_meta else None
+        existing_detail = load_existing_rule_detail(server_repo_path, rule.rule_id)
         existing_summary = None
         existing_last_updated = None
         if isinstance(existing_detail, dict):
@@ -775,7 +820,6 @@ def process_school_rules(
         elif existing_meta:
             existing_summary = existing_meta.get("summary")
 
-        pdf_url_changed = existing_pdf_url is None or existing_pdf_url != rule.pdf_url
         metadata_changed = False
         if existing_detail:
             metadata_changed = (
@@ -785,20 +829,19 @@ def process_school_rules(
                 or existing_detail.get("pdfUrl") != rule.pdf_url
             )
 
-        needs_content_update = pdf_url_changed and bool(rule.pdf_url)
+        needs_content_update = bool(rule.pdf_url and existing_pdf_url != rule.pdf_url)
         needs_metadata_update = metadata_changed and existing_detail is not None
 
         updated_detail: Optional[Dict[str, Any]] = None
 
         if needs_content_update:
             pdf_path = downloads_dir / f"{rule.rule_id}.pdf"
-            temp_path = pdf_path.with_suffix(".tmp")
-            if not download_pdf(rule.pdf_url, temp_path):
+            downloaded, pdf_hash, temp_path = download_results[index]
+            if not downloaded:
                 logger.error("Failed to download PDF: %s", rule.pdf_url)
                 if existing_detail is None:
                     failed_rule_ids.append(rule.rule_id)
                 continue
-            pdf_hash = get_file_hash(temp_path)
 
             if pdf_hash and pdf_hash in processed_hashes and existing_detail is not None:
                 logger.info("PDF already processed (hash match), skipping content regeneration: %s", rule.rule_id)
@@ -834,31 +877,34 @@ def process_school_rules(
                     collected_hashes.append(pdf_hash)
 
         if not needs_content_update and needs_metadata_update and existing_detail:
-            updated_detail = dict(existing_detail)
-            updated_detail["chapterId"] = rule.chapter_id
-            updated_detail["title"] = rule.rule_title
-            updated_detail["order"] = rule.rule_order
-            updated_detail["pdfUrl"] = rule.pdf_url
-            updated_detail.setdefault("summary", existing_summary)
-            updated_detail.setdefault("sourcePage", None)
-            updated_detail.setdefault("lastUpdated", existing_last_updated)
+            updated_detail = dict(
+                existing_detail,
+                chapterId=rule.chapter_id,
+                title=rule.rule_title,
+                order=rule.rule_order,
+                pdfUrl=rule.pdf_url,
+            )
+            if "summary" not in updated_detail:
+                updated_detail["summary"] = existing_summary
+            if "sourcePage" not in updated_detail:
+                updated_detail["sourcePage"] = None
+            if "lastUpdated" not in updated_detail:
+                updated_detail["lastUpdated"] = existing_last_updated
             updated_rule_ids.append(rule.rule_id)
 
         if updated_detail:
-            if not updated_detail.get("sections") and not updated_detail.get("articles"):
+            if not (updated_detail.get("sections") or updated_detail.get("articles")):
                 logger.warning(
                     "Rule content empty after compose: %s (%s)",
                     rule.rule_id,
                     rule.pdf_url,
                 )
-            rule_json_path = rules_dir / f"{rule.rule_id}.json"
-            rule_json_path.write_text(json.dumps(updated_detail, ensure_ascii=False, indent=2), encoding="utf-8")
-
-        rule_summary = None
-        if updated_detail:
+            pending_writes.append((rules_dir / f"{rule.rule_id}.json", updated_detail))
             rule_summary = updated_detail.get("summary")
-        elif isinstance(existing_summary, str):
-            rule_summary = existing_summary
+            rule_last_updated = updated_detail.get("lastUpdated")
+        else:
+            rule_summary = existing_summary if isinstance(existing_summary, str) else None
+            rule_last_updated = existing_last_updated
 
         rules_meta.append(
             {
@@ -869,38 +915,35 @@ def process_school_rules(
                 "order": rule.rule_order,
                 "pdfUrl": rule.pdf_url,
                 "sourcePage": None,
-                "lastUpdated": updated_detail.get("lastUpdated") if updated_detail else existing_last_updated,
+                "lastUpdated": rule_last_updated,
+                "_sortKey": rule.chapter_order * RULE_ORDER_STRIDE + rule.rule_order,
             }
         )
 
+    # Rule files are independent, so overlap their I/O instead of writing serially.
+    if pending_writes:
+        with ThreadPoolExecutor(max_workers=RULE_WRITE_WORKERS) as executor:
+            written = sum(executor.map(lambda item: _write_json_if_changed(*item), pending_writes))
+        logger.debug("Rule JSON written: %s/%s (rest unchanged)", written, len(pending_writes))
+
     chapters_payload = {
         "version": version,
         "generatedAt": generated_at.isoformat(),
         "chapters": chapters_list,
     }
-    chapter_order_map = {chapter["id"]: chapter["order"] for chapter in chapters_list}
+    rules_meta.sort(key=itemgetter("_sortKey"))
+    for meta in rules_meta:
+        del meta["_sortKey"]
     index_payload = {
         "version": version,
         "generatedAt": generated_at.isoformat(),
         "chapters": chapters_list,
-        "rules": sorted(
-            rules_meta,
-            key=lambda x: (chapter_order_map.get(x["chapterId"], 9999), x["order"]),
-        ),
+        "rules": rules_meta,
     }
 
-    (rules_output / "structure.json").write_text(
-        json.dumps(structure, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
-    (rules_output / "index.json").write_text(
-        json.dumps(index_payload, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
-    (rules_output / "chapters.json").write_text(
-        json.dumps(chapters_payload, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    _write_json_if_changed(rules_output / "structure.json", structure)
+    _write_json_if_changed(rules_output / "index.json", index_payload)
+    _write_json_if_changed(rules_output / "chapters.json", chapters_payload)
 
     manifest = {
         "version": version,
@@ -918,10 +961,7 @@ def process_school_rules(
         "model": model_list[0],
         "models": model_list,
     }
-    (rules_output / "manifest.json").write_text(
-        json.dumps(manifest, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    _write_bytes(rules_output / "manifest.json", _dump_json_bytes(manifest))
 
     logger.info(
         "Rules processing done. Updated=%s, regenerated=%s, removed=%s",
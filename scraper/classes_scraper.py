@@ -10,9 +10,10 @@ import logging
 import requests
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 
+from scraper.html_utils import parse_html
+
 logger = logging.getLogger(__name__)
 
 
@@ -54,6 +55,14 @@ TERM_KEYWORDS = {
     ),
 }
 
+# 学期判定用に (学期, キーワード) を優先順に平坦化したもの。
+# キーワードは大文字小文字の区別がない文字のみなので、lower() での比較は不要。
+TERM_KEYWORDS_FLAT = tuple(
+    (term_value, keyword)
+    for term_value, keywords in TERM_KEYWORDS.items()
+    for keyword in keywords
+)
+
 
 CLASSES_URL = "https://www.wakayama-nct.ac.jp/campuslife/education/program/"
 
@@ -74,27 +83,24 @@ def extract_pdf_links(html: str, base_url: str) -> List[Dict[str, Any]]:
     Returns:
         PDFリンク情報のリスト（url, text, year, term を含む）
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
     pdf_links = []
     
-    # すべてのaタグを検索
-    for link in soup.find_all("a", href=True):
+    # hrefに".pdf"を含むaタグのみを検索（大文字小文字は区別しない）
+    for link in soup.select('a[href*=".pdf" i]'):
         href = link.get("href", "")
         text = link.get_text(strip=True)
+        full_url = urljoin(base_url, href)
+        
+        # 年度・学期情報を抽出
+        year_term = extract_year_term_from_text(text + " " + href)
         
-        # PDFリンクかチェック
-        if href.lower().endswith(".pdf") or ".pdf" in href.lower():
-            full_url = urljoin(base_url, href)
-            
-            # 年度・学期情報を抽出
-            year_term = extract_year_term_from_text(text + " " + href)
-            
-            pdf_links.append({
-                "url": full_url,
-                "text": text,
-                "year": year_term.get("year"),
-                "term": year_term.get("term"),
-            })
+        pdf_links.append({
+            "url": full_url,
+            "text": text,
+            "year": year_term.get("year"),
+            "term": year_term.get("term"),
+        })
     
     return pdf_links
 
@@ -134,13 +140,9 @@ def extract_year_term_from_text(text: str) -> Dict[str, Optional[int]]:
             result["year"] = year
     
     # 学期パターン（前期=0, 後期=1）
-    lower_text = normalized_text.lower()
-    for term_value, keywords in TERM_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in normalized_text or keyword.lower() in lower_text:
-                result["term"] = term_value
-                break
-        if result["term"] is not None:
+    for term_value, keyword in TERM_KEYWORDS_FLAT:
+        if keyword in normalized_text:
+            result["term"] = term_value
             break
     
     return result
@@ -175,8 +177,8 @@ def find_latest_pdf_url(html: str, base_url: str) -> Optional[str]:
     next_year = academic_year if next_term == 1 else academic_year + 1
     
     def sort_key(link: Dict[str, Any]) -> tuple:
-        year = link.get("year")
-        term = link.get("term")
+        year = link["year"]
+        term = link["term"]
         
         if year is None or term is None:
             return (3, 0, 0)  # 情報がないものは最後
@@ -191,8 +193,8 @@ def find_latest_pdf_url(html: str, base_url: str) -> Optional[str]:
         else:
             return (2, year, term)
     
-    sorted_links = sorted(pdf_links, key=sort_key)
-    return sorted_links[0]["url"] if sorted_links else None
+    # 先頭の1件だけが必要なので、全体をソートせず最小値を線形探索する
+    return min(pdf_links, key=sort_key)["url"]
 
 
 def scrape_classes_page() -> Optional[str]:
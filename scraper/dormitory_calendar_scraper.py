@@ -5,17 +5,26 @@
 from __future__ import annotations
 
 import logging
+import re
 from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
+
+from scraper.html_utils import parse_html
 
 logger = logging.getLogger(__name__)
 
 DORMITORY_CALENDAR_URL = "https://www.wakayama-nct.ac.jp/campuslife/dormitory/calendar/"
 
 CALENDAR_KEYWORDS = ("行事", "学寮", "寮", "calendar", "schedule")
+HEADING_TAGS = ("h1", "h2", "h3")
+# Lookahead so overlapping keywords (e.g. 学寮 and 寮) are each found once.
+CALENDAR_KEYWORDS_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, CALENDAR_KEYWORDS)) + "))",
+    re.IGNORECASE,
+)
+URL_KEYWORDS_RE = re.compile("calendar|schedule")
 
 
 def _get_image_src(img) -> Optional[str]:
@@ -26,34 +35,40 @@ def _get_image_src(img) -> Optional[str]:
     return None
 
 
-def _nearest_heading(img) -> str:
-    heading_tag = img.find_previous(["h1", "h2", "h3"])
-    if heading_tag:
-        return heading_tag.get_text(strip=True)
-    return ""
-
-
 def extract_calendar_images(html: str, base_url: str) -> List[Dict[str, Any]]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
     pagebody = soup.find(class_="pagebody")
     search_root = pagebody or soup
 
+    # Track the nearest preceding heading in one document-order walk instead
+    # of searching backwards from every image.
+    current_heading = ""
+    if pagebody is not None:
+        heading_tag = pagebody.find_previous(HEADING_TAGS)
+        if heading_tag:
+            current_heading = heading_tag.get_text(strip=True)
+
     images: List[Dict[str, Any]] = []
     seen = set()
-    for img in search_root.find_all("img"):
-        src = _get_image_src(img)
+    for element in search_root.descendants:
+        name = getattr(element, "name", None)
+        if name in HEADING_TAGS:
+            current_heading = element.get_text(strip=True)
+            continue
+        if name != "img":
+            continue
+        src = _get_image_src(element)
         if not src:
             continue
         full_url = urljoin(base_url, src)
         if full_url in seen:
             continue
         seen.add(full_url)
-        alt = (img.get("alt") or "").strip()
-        heading = _nearest_heading(img)
+        alt = (element.get("alt") or "").strip()
         images.append({
             "url": full_url,
             "alt": alt,
-            "heading": heading,
+            "heading": current_heading,
         })
 
     return images
@@ -63,10 +78,8 @@ def _score_image(info: Dict[str, Any]) -> int:
     score = 0
     url = info.get("url", "")
     text = f"{info.get('alt', '')} {info.get('heading', '')}".lower()
-    for keyword in CALENDAR_KEYWORDS:
-        if keyword.lower() in text:
-            score += 5
-    if "calendar" in url or "schedule" in url:
+    score += 5 * len(set(CALENDAR_KEYWORDS_RE.findall(text)))
+    if URL_KEYWORDS_RE.search(url):
         score += 2
     if url.lower().endswith((".png", ".jpg", ".jpeg")):
         score += 1
@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 
+import heapq
 import re
 import logging
 import unicodedata
@@ -12,7 +13,8 @@ from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
+
+from scraper.html_utils import parse_html
 
 logger = logging.getLogger(__name__)
 
@@ -68,7 +70,7 @@ def extract_pdf_links(html: str, base_url: str) -> List[Dict[str, Any]]:
 
     Returns a list containing the resolved URL and any detected date metadata.  
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
     pdf_links: List[Dict[str, Any]] = []
     seen_urls: set[str] = set()
 
@@ -80,11 +82,8 @@ def extract_pdf_links(html: str, base_url: str) -> List[Dict[str, Any]]:
     else:
         search_root = pagebody
 
-    for link in search_root.find_all("a", href=True):
+    for link in search_root.select('a[href*=".pdf" i]'):
         href = link.get("href", "")
-        if not href or ".pdf" not in href.lower():
-            continue
-
         full_url = urljoin(base_url, href)
         if full_url in seen_urls:
             continue
@@ -213,14 +212,12 @@ def find_current_and_next_pdf_links(html: str, base_url: str) -> List[Dict[str,
             return (group, abs(delta), link.get("url", ""))
         return (2, 0, link.get("url", ""))
 
-    fallback_links = sorted(pdf_links, key=sort_key)
+    # Only the two best candidates are needed, so avoid sorting every link.
     results: List[Dict[str, Any]] = []
-    for link in fallback_links:
+    for link in heapq.nsmallest(2, pdf_links, key=sort_key):
         item = dict(link)
         item.setdefault("target", "fallback")
         results.append(item)
-        if len(results) >= 2:
-            break
 
     return results
 
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Shared HTML parsing helpers for the scrapers."""
+
+from __future__ import annotations
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+
+def parse_html(html: str) -> BeautifulSoup:
+    """Parse HTML with lxml, falling back to html.parser when lxml is missing."""
+    try:
+        return BeautifulSoup(html, "lxml")
+    except FeatureNotFound:  # pragma: no cover - lxml not installed
+        return BeautifulSoup(html, "html.parser")
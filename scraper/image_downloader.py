@@ -14,7 +14,16 @@ import requests
 logger = logging.getLogger(__name__)
 
 
-def download_image(url: str, save_path: Path, headers: Optional[dict] = None) -> bool:
+IMAGE_MAGIC_PREFIXES = (b"\xff\xd8", b"\x89PNG")
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def download_image_with_hash(url: str, save_path: Path, headers: Optional[dict] = None) -> Optional[str]:
+    """
+    Stream the image to save_path, hashing it on the way.
+
+    Returns the SHA256 of the saved file, or None if the download failed.
+    """
     logger.info(f"Downloading image: {url} -> {save_path}")
     try:
         default_headers = {
@@ -23,22 +32,39 @@ def download_image(url: str, save_path: Path, headers: Optional[dict] = None) ->
         if headers:
             default_headers.update(headers)
 
-        response = requests.get(url, headers=default_headers, timeout=30)
-        response.raise_for_status()
-
-        content_type = response.headers.get("Content-Type", "").lower()
-        if "image" not in content_type and not response.content.startswith((b"\xff\xd8", b"\x89PNG")):
-            logger.warning(f"Content-Type is not image: {content_type}")
-            return False
-
-        save_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(save_path, "wb") as f:
-            f.write(response.content)
-        logger.info(f"Image downloaded: {save_path} ({len(response.content)} bytes)")
-        return True
+        with requests.get(url, headers=default_headers, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+            head = next((chunk for chunk in chunks if chunk), b"")
+
+            content_type = response.headers.get("Content-Type", "").lower()
+            if "image" not in content_type and not head.startswith(IMAGE_MAGIC_PREFIXES):
+                logger.warning(f"Content-Type is not image: {content_type}")
+                return None
+
+            save_path.parent.mkdir(parents=True, exist_ok=True)
+            digest = hashlib.sha256(head)
+            size = len(head)
+            try:
+                with open(save_path, "wb") as f:
+                    f.write(head)
+                    for chunk in chunks:
+                        digest.update(chunk)
+                        f.write(chunk)
+                        size += len(chunk)
+            except BaseException:
+                # Do not leave a truncated file behind when the stream fails mid-body.
+                save_path.unlink(missing_ok=True)
+                raise
+        logger.info(f"Image downloaded: {save_path} ({size} bytes)")
+        return digest.hexdigest()
     except Exception as e:
         logger.error(f"Image download error ({url}): {e}", exc_info=True)
-        return False
+        return None
+
+
+def download_image(url: str, save_path: Path, headers: Optional[dict] = None) -> bool:
+    return download_image_with_hash(url, save_path, headers) is not None
 
 
 def get_file_hash(file_path: Path) -> Optional[str]:
@@ -71,9 +97,9 @@ def check_image_updated(
 
     if not local_path.exists() or url_changed:
         temp_path = local_path.with_suffix(".tmp")
-        if download_image(url, temp_path):
-            new_hash = get_file_hash(temp_path)
-            if new_hash and last_hash and not url_changed and new_hash == last_hash:
+        new_hash = download_image_with_hash(url, temp_path)
+        if new_hash:
+            if last_hash and not url_changed and new_hash == last_hash:
                 temp_path.unlink(missing_ok=True)
                 return False, new_hash
             temp_path.replace(local_path)
@@ -81,13 +107,12 @@ def check_image_updated(
         return True, None
 
     temp_path = local_path.with_suffix(".tmp")
-    if download_image(url, temp_path):
-        new_hash = get_file_hash(temp_path)
-        old_hash = get_file_hash(local_path)
-        if new_hash and old_hash and new_hash != old_hash:
+    new_hash = download_image_with_hash(url, temp_path)
+    if new_hash:
+        if local_hash and new_hash != local_hash:
             temp_path.replace(local_path)
             return True, new_hash
         temp_path.unlink(missing_ok=True)
-        return False, new_hash or old_hash
+        return False, new_hash
 
-    return False, last_hash or get_file_hash(local_path)
+    return False, last_hash or local_hash
@@ -6,19 +6,90 @@ PDFリンクからPDFをダウンロードし、更新チェックを行う
 """
 
 import os
+import json
 import hashlib
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 from urllib.parse import urljoin, urlparse
 
 logger = logging.getLogger(__name__)
 
+# 同一サーバーへの同時接続数を抑えるため、並列ダウンロード数は控えめにする
+PDF_DOWNLOAD_WORKERS = 4
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# 更新チェック用フィンガープリントで比較する先頭・末尾のバイト数
+FINGERPRINT_RANGE_SIZE = 64 * 1024
 
-def download_pdf(url: str, save_path: Path, headers: Optional[dict] = None) -> bool:
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+
+def _create_session() -> requests.Session:
+    """同一ホストへのTLS接続を使い回すためのセッションを作成する"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_SESSION = _create_session()
+
+
+def _save_pdf_response(response: requests.Response, save_path: Path) -> Optional[str]:
     """
-    PDFをダウンロードする
+    レスポンス本文がPDFであることを確認しながらストリーミング保存する
+    
+    書き込みと同時にSHA256を計算するため、保存後にファイルを読み直す必要はない
+    
+    Returns:
+        保存したファイルのSHA256ハッシュ（PDFでない場合はNone）
+    """
+    logger.debug(f"レスポンス受信: ステータス={response.status_code}")
+    chunks = response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+    head = next((chunk for chunk in chunks if chunk), b"")
+    
+    # Content-Typeチェック
+    content_type = response.headers.get("Content-Type", "").lower()
+    if "pdf" not in content_type:
+        # 実際の内容を確認
+        if not head.startswith(b"%PDF"):
+            logger.warning(f"Content-TypeがPDFではない、かつPDFマジックナンバーも不一致: {content_type}")
+            return None
+    
+    save_path.parent.mkdir(parents=True, exist_ok=True)
+    logger.debug(f"ファイルを保存中: {save_path}")
+    digest = hashlib.sha256(head)
+    size = len(head)
+    try:
+        with open(save_path, "wb") as f:
+            f.write(head)
+            for chunk in chunks:
+                digest.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+    except BaseException:
+        # 受信途中で失敗した場合、途中まで書かれたファイルを残さない
+        save_path.unlink(missing_ok=True)
+        raise
+    
+    logger.info(f"PDFダウンロード完了: {save_path} ({size}バイト)")
+    return digest.hexdigest()
+
+
+def download_pdf_with_hash(url: str, save_path: Path, headers: Optional[dict] = None) -> Tuple[bool, Optional[str]]:
+    """
+    PDFをダウンロードし、保存と同時にSHA256ハッシュを計算する
     
     Args:
         url: PDFのURL
@@ -26,43 +97,65 @@ def download_pdf(url: str, save_path: Path, headers: Optional[dict] = None) -> b
         headers: HTTPリクエストヘッダー
     
     Returns:
-        ダウンロード成功したかどうか
+        (ダウンロード成功したかどうか, 保存したファイルのハッシュ)
     """
     logger.info(f"PDFダウンロードを開始: {url} -> {save_path}")
     try:
-        default_headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        if headers:
-            default_headers.update(headers)
+        request_headers = {**DEFAULT_HEADERS, **headers} if headers else DEFAULT_HEADERS
         
         logger.debug(f"リクエスト送信中...")
-        response = requests.get(url, headers=default_headers, timeout=30)
-        response.raise_for_status()
-        logger.debug(f"レスポンス受信: ステータス={response.status_code}, サイズ={len(response.content)}バイト")
-        
-        # Content-Typeチェック
-        content_type = response.headers.get("Content-Type", "").lower()
-        if "pdf" not in content_type:
-            # 実際の内容を確認
-            if not response.content.startswith(b"%PDF"):
-                logger.warning(f"Content-TypeがPDFではない、かつPDFマジックナンバーも不一致: {content_type}")
-                return False
-        
-        save_path.parent.mkdir(parents=True, exist_ok=True)
-        logger.debug(f"ファイルを保存中: {save_path}")
-        with open(save_path, "wb") as f:
-            f.write(response.content)
-        
-        logger.info(f"PDFダウンロード完了: {save_path} ({len(response.content)}バイト)")
-        return True
+        with _SESSION.get(url, headers=request_headers, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            file_hash = _save_pdf_response(response, save_path)
+        return file_hash is not None, file_hash
     except Exception as e:
         logger.error(f"PDFダウンロードエラー ({url}): {e}", exc_info=True)
-        return False
+        return False, None
+
+
+def download_pdf(url: str, save_path: Path, headers: Optional[dict] = None) -> bool:
+    """
+    PDFをダウンロードする
+    
+    Args:
+        url: PDFのURL
+        save_path: 保存先パス
+        headers: HTTPリクエストヘッダー
+    
+    Returns:
+        ダウンロード成功したかどうか
+    """
+    downloaded, _ = download_pdf_with_hash(url, save_path, headers)
+    return downloaded
+
+
+def download_pdfs(
+    items: Sequence[Tuple[str, Path]],
+    headers: Optional[dict] = None,
+    max_workers: int = PDF_DOWNLOAD_WORKERS,
+) -> List[Tuple[bool, Optional[str]]]:
+    """
+    複数のPDFを並列にダウンロードする
+    
+    Args:
+        items: (PDFのURL, 保存先パス) のリスト
+        headers: HTTPリクエストヘッダー
+        max_workers: 同時ダウンロード数の上限
+    
+    Returns:
+        itemsと同じ順序の (ダウンロード成功したかどうか, ファイルのハッシュ) のリスト
+    """
+    if not items:
+        return []
+    logger.info(f"PDFを並列ダウンロード中: {len(items)}件 (最大{max_workers}並列)")
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(lambda item: download_pdf_with_hash(item[0], item[1], headers), items))
 
 
 def get_file_hash(file_path: Path) -> Optional[str]:
-    """ファイルのSHA256ハッシュを取得"""
+    """
+    ファイルのSHA256ハッシュを取得（ファイル全体は読み込まず、チャンク単位でハッシュする）
+    """
     if not file_path.exists():
         logger.debug(f"ファイルが存在しません: {file_path}")
         return None
@@ -70,19 +163,127 @@ def get_file_hash(file_path: Path) -> Optional[str]:
     try:
         logger.debug(f"ファイルのハッシュを計算中: {file_path}")
         with open(file_path, "rb") as f:
-            content = f.read()
-            hash_value = hashlib.sha256(content).hexdigest()
-            logger.debug(f"ハッシュ計算完了: {hash_value[:16]}...")
-            return hash_value
+            if hasattr(hashlib, "file_digest"):
+                # Python 3.11以降: 再利用バッファへreadintoしながらハッシュする
+                digest = hashlib.file_digest(f, "sha256")
+            else:
+                digest = hashlib.sha256()
+                for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+        hash_value = digest.hexdigest()
+        logger.debug(f"ハッシュ計算完了: {hash_value[:16]}...")
+        return hash_value
     except Exception as e:
         logger.warning(f"ハッシュ計算エラー: {e}")
         return None
 
 
+def _meta_path(local_path: Path) -> Path:
+    return local_path.with_name(local_path.name + ".meta.json")
+
+
+def _load_pdf_meta(local_path: Path) -> Dict[str, Any]:
+    """
+    ローカルPDFの検証用メタ情報（ETag, Last-Modified, ハッシュ）を読み込む
+    
+    メタ情報を書いた後にローカルファイルが変わっている場合は使えないため空を返す
+    """
+    try:
+        meta = json.loads(_meta_path(local_path).read_text(encoding="utf-8"))
+        stat = local_path.stat()
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(meta, dict):
+        return {}
+    if meta.get("size") != stat.st_size or meta.get("mtime_ns") != stat.st_mtime_ns:
+        logger.debug(f"メタ情報がローカルファイルと一致しないため無視します: {local_path}")
+        return {}
+    return meta
+
+
+def _fingerprint(total_size: int, head: bytes, tail: bytes) -> str:
+    digest = hashlib.sha256(str(total_size).encode("ascii"))
+    digest.update(b"\0")
+    digest.update(head)
+    digest.update(tail)
+    return digest.hexdigest()
+
+
+def _local_fingerprint(local_path: Path) -> Optional[str]:
+    """ローカルファイルの先頭・末尾とサイズからフィンガープリントを計算する（全体は読まない）"""
+    try:
+        with open(local_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            head = f.read(FINGERPRINT_RANGE_SIZE)
+            tail = b""
+            if size > FINGERPRINT_RANGE_SIZE:
+                f.seek(size - FINGERPRINT_RANGE_SIZE)
+                tail = f.read(FINGERPRINT_RANGE_SIZE)
+    except OSError:
+        return None
+    return _fingerprint(size, head, tail)
+
+
+def _fetch_range(url: str, start: int, end: int) -> Optional[Tuple[bytes, int]]:
+    """
+    Rangeリクエストで指定範囲を取得する
+    
+    Returns:
+        (取得したバイト列, ファイル全体のサイズ)。206以外が返った場合はNone
+    """
+    request_headers = {**DEFAULT_HEADERS, "Range": f"bytes={start}-{end}"}
+    with _SESSION.get(url, headers=request_headers, timeout=30, stream=True) as response:
+        if response.status_code != 206:
+            # Range非対応のサーバーは本文全体を返すため、読まずに閉じる
+            return None
+        content_range = response.headers.get("Content-Range", "")
+        total = content_range.rpartition("/")[2]
+        if not total.isdigit():
+            return None
+        return response.content, int(total)
+
+
+def _remote_fingerprint(url: str) -> Optional[str]:
+    """リモートファイルの先頭・末尾だけをRangeリクエストで取得してフィンガープリントを計算する"""
+    first = _fetch_range(url, 0, FINGERPRINT_RANGE_SIZE - 1)
+    if first is None:
+        return None
+    head, total = first
+    tail = b""
+    if total > FINGERPRINT_RANGE_SIZE:
+        last = _fetch_range(url, total - FINGERPRINT_RANGE_SIZE, total - 1)
+        if last is None or last[1] != total:
+            return None
+        tail = last[0]
+    return _fingerprint(total, head, tail)
+
+
+def _save_pdf_meta(local_path: Path, response_headers: Mapping[str, str], file_hash: Optional[str]) -> None:
+    """次回の条件付きリクエスト用にETag等をローカルPDFの横に保存する"""
+    try:
+        stat = local_path.stat()
+        meta = {
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+            "sha256": file_hash,
+            "fingerprint": _local_fingerprint(local_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+        _meta_path(local_path).write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    except OSError as e:
+        logger.warning(f"PDFメタ情報の保存に失敗しました: {local_path}, エラー: {e}")
+
+
 def check_pdf_updated(url: str, local_path: Path) -> Tuple[bool, Optional[str]]:
     """
     PDFが更新されているかチェック
     
+    前回取得時のETag/Last-Modifiedがあれば条件付きGETを送り、
+    304 Not Modifiedなら本文を受け取らずに更新なしと判定する。
+    サーバーがこれらを返さない場合は、先頭・末尾のRange取得によるフィンガープリントが
+    前回と一致すれば更新なしと判定する
+    
     Args:
         url: PDFのURL
         local_path: ローカルのPDFパス
@@ -95,40 +296,53 @@ def check_pdf_updated(url: str, local_path: Path) -> Tuple[bool, Optional[str]]:
         logger.info("ローカルファイルが存在しないため、更新ありと判定")
         return True, None
     
+    temp_path = local_path.with_suffix(".tmp")
     try:
-        # リモートのContent-Lengthを取得（簡易チェック）
-        logger.debug("リモートファイルのサイズを確認中...")
-        response = requests.head(url, timeout=10)
-        remote_size = response.headers.get("Content-Length")
+        meta = _load_pdf_meta(local_path)
+        if meta.get("fingerprint") and not (meta.get("etag") or meta.get("last_modified")):
+            logger.debug("Rangeリクエストでリモートファイルのフィンガープリントを確認中...")
+            if _remote_fingerprint(url) == meta["fingerprint"]:
+                logger.info("フィンガープリントが一致したため、更新なしと判定")
+                return False, meta.get("sha256") or get_file_hash(local_path)
         
-        if remote_size:
-            local_size = local_path.stat().st_size
-            logger.debug(f"サイズ比較: リモート={remote_size}, ローカル={local_size}")
-            if int(remote_size) != local_size:
-                logger.info(f"ファイルサイズが異なるため、更新ありと判定")
-                return True, None
+        request_headers = dict(DEFAULT_HEADERS)
+        if meta.get("etag"):
+            request_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            request_headers["If-Modified-Since"] = meta["last_modified"]
+        
+        logger.debug("条件付きGETでリモートファイルを確認中...")
+        with _SESSION.get(url, headers=request_headers, timeout=30, stream=True) as response:
+            if response.status_code == 304:
+                logger.info("サーバーが304 Not Modifiedを返したため、更新なしと判定")
+                return False, meta.get("sha256") or get_file_hash(local_path)
+            response.raise_for_status()
+            
+            # 一時ファイルへストリーミング保存しつつハッシュを計算
+            new_hash = _save_pdf_response(response, temp_path)
+            response_headers = response.headers
         
-        # 実際にダウンロードしてハッシュ比較
-        logger.debug("ハッシュ比較のため一時ファイルをダウンロード中...")
-        temp_path = local_path.with_suffix(".tmp")
-        if download_pdf(url, temp_path):
-            new_hash = get_file_hash(temp_path)
-            old_hash = get_file_hash(local_path)
+        if new_hash:
+            old_hash = meta.get("sha256") or get_file_hash(local_path)
             
             logger.debug(f"ハッシュ比較: 新={new_hash[:16] if new_hash else 'None'}..., 旧={old_hash[:16] if old_hash else 'None'}...")
             if new_hash != old_hash:
                 logger.info("ハッシュが異なるため、更新ありと判定")
                 temp_path.replace(local_path)
+                _save_pdf_meta(local_path, response_headers, new_hash)
                 return True, new_hash
             else:
                 logger.info("ハッシュが同一のため、更新なしと判定")
                 temp_path.unlink(missing_ok=True)
+                _save_pdf_meta(local_path, response_headers, old_hash)
                 return False, old_hash
         
         logger.warning("一時ファイルのダウンロードに失敗したため、更新なしと判定")
-        return False, get_file_hash(local_path)
+        return False, meta.get("sha256") or get_file_hash(local_path)
     except Exception as e:
         logger.error(f"PDF更新チェックエラー ({url}): {e}", exc_info=True)
+        # 途中まで書かれた一時ファイルを残さない
+        temp_path.unlink(missing_ok=True)
         # エラー時は更新ありとみなす
         logger.warning("エラーにより更新ありと判定")
         return True, None
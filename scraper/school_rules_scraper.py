@@ -7,24 +7,37 @@ from __future__ import annotations
 import logging
 import re
 import time
-from typing import Dict, Iterable, Iterator, List, Optional, cast
+from functools import lru_cache
+from typing import Dict, List, Optional
 from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import Tag
+
+from scraper.html_utils import parse_html
 
 logger = logging.getLogger(__name__)
 
 RULES_URL = "https://www.wakayama-nct.ac.jp/about/profile/rules/"
+HEADING_TAGS = ("h1", "h2", "h3")
+
+_WS_RE = re.compile(r"\s+")
+_WS_CHECK_RE = re.compile(r"\s")
 
 
 def normalize_text(text: str) -> str:
     """Normalize spaces and whitespace."""
     if not text:
         return ""
-    normalized = text.replace("\u3000", " ")
-    normalized = re.sub(r"\s+", " ", normalized)
-    return normalized.strip()
+    return _normalize_text_cached(text)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_text_cached(text: str) -> str:
+    # Link names repeat across sections; most contain no whitespace to collapse.
+    if not _WS_CHECK_RE.search(text):
+        return text
+    return _WS_RE.sub(" ", text.replace("\u3000", " ")).strip()
 
 
 def fetch_html(url: str, timeout: float = 15.0, retries: int = 3, backoff: float = 1.5) -> str:
@@ -58,96 +71,83 @@ def _normalize_href(value: object) -> str:
     return str(value).strip()
 
 
-def _iter_anchors(nodes: Iterable[Tag]) -> Iterator[Tag]:
-    for node in nodes:
-        if not isinstance(node, Tag):
-            continue
-        if node.name == "a" and node.has_attr("href"):
-            yield node
-        for anchor in node.find_all("a", href=True):
-            if isinstance(anchor, Tag):
-                yield anchor
+def _is_pdf_href(href: str) -> bool:
+    # Only the 3-char extension is lowered, not the whole URL.
+    return len(href) >= 4 and href[-4] == "." and href[-3:].lower() == "pdf"
+
+
+def _anchor_link(anchor: Tag, base_url: str, pdf_only: bool) -> Optional[Dict[str, str]]:
+    name = normalize_text(anchor.get_text(strip=True))
+    href = _normalize_href(anchor.get("href"))
+    if not name or not href:
+        return None
+    if pdf_only and not _is_pdf_href(href):
+        return None
+    return {"name": name, "url": urljoin(base_url, href)}
 
 
 def extract_links(nodes: List[Tag], base_url: Optional[str], pdf_only: bool = False) -> List[Dict[str, str]]:
     """Extract anchor links from a list of nodes."""
     items: List[Dict[str, str]] = []
     seen = set()
-    for anchor in _iter_anchors(nodes):
-        name = normalize_text(anchor.get_text(strip=True))
-        href = _normalize_href(anchor.get("href"))
-        if not name or not href:
-            continue
-        if pdf_only and not href.lower().endswith(".pdf"):
-            continue
-        url = urljoin(base_url or "", href)
-        key = (name, url)
-        if key in seen:
+    base = base_url or ""
+    for node in nodes:
+        if not isinstance(node, Tag):
             continue
-        seen.add(key)
-        items.append({"name": name, "url": url})
-    return items
-
-
-def extract_links_until_next_heading(
-    heading: Tag,
-    container: Tag,
-    base_url: Optional[str],
-    pdf_only: bool = False,
-) -> List[Dict[str, str]]:
-    """Extract links from nodes following the heading until the next heading."""
-    items: List[Dict[str, str]] = []
-    seen = set()
-    for element in heading.next_elements:
-        if isinstance(element, Tag):
-            if container not in element.parents:
-                break
-            if element.name in {"h1", "h2", "h3"}:
-                break
-            if element.name != "a" or not element.has_attr("href"):
-                continue
-            name = normalize_text(element.get_text(strip=True))
-            href = _normalize_href(element.get("href"))
-            if not name or not href:
-                continue
-            if pdf_only and not href.lower().endswith(".pdf"):
+        anchors = node.find_all("a", href=True)
+        if node.name == "a" and node.has_attr("href"):
+            anchors.insert(0, node)
+        for anchor in anchors:
+            link = _anchor_link(anchor, base, pdf_only)
+            if link is None:
                 continue
-            url = urljoin(base_url or "", href)
-            key = (name, url)
+            key = (link["name"], link["url"])
             if key in seen:
                 continue
             seen.add(key)
-            items.append({"name": name, "url": url})
+            items.append(link)
     return items
 
 
 def parse_rules(html: str, base_url: Optional[str] = None, pdf_only: bool = False) -> List[Dict[str, object]]:
-    """Parse school rules page into chapter entries."""
-    soup = None
-    for parser in ("lxml", "html.parser"):
-        try:
-            soup = BeautifulSoup(html, parser)
-            break
-        except Exception:  # pragma: no cover - fallback
-            continue
-    if soup is None:
-        return []
+    """Parse school rules page into chapter entries.
 
+    The container is walked once; each h2/h3 opens a new section that collects
+    links until the next h1/h2/h3.
+    """
+    soup = parse_html(html)
     container = soup.select_one("div.pagebody") or soup
-    headings: List[Tag] = [cast(Tag, h) for h in container.find_all(["h2", "h3"]) if isinstance(h, Tag)]
+    base = base_url or ""
     result: List[Dict[str, object]] = []
+    items: Optional[List[Dict[str, str]]] = None
+    seen: set = set()
 
-    for heading in headings:
-        title = normalize_text(heading.get_text(" ", strip=True))
-        if not title:
+    for element in container.descendants:
+        if not isinstance(element, Tag):
             continue
-
-        items = extract_links_until_next_heading(heading, container, base_url, pdf_only=pdf_only)
-
-        if items:
+        if element.name in HEADING_TAGS:
+            items = None
+            if element.name == "h1":
+                continue
+            title = normalize_text(element.get_text(" ", strip=True))
+            if not title:
+                continue
+            items = []
+            seen = set()
             result.append({"name": title, "contents": items})
+            continue
+        if items is None or element.name != "a" or not element.has_attr("href"):
+            continue
+        link = _anchor_link(element, base, pdf_only)
+        if link is None:
+            continue
+        key = (link["name"], link["url"])
+        if key in seen:
+            continue
+        seen.add(key)
+        items.append(link)
 
-    return result
+    return [chapter for chapter in result if chapter["contents"]]
 
 
 def scrape_rules_page(url: str = RULES_URL, pdf_only: bool = True) -> List[Dict[str, object]]:
@@ -5,14 +5,195 @@
 出力JSONをWakayamaServerの適切なディレクトリに配置
 """
 
+import filecmp
 import json
 import logging
+import os
 import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Literal, Optional, Set, Tuple
+from typing import Callable, Dict, Iterator, List, Literal, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
+# コピーはI/O待ちが主体（GILも解放される）なので、スレッドで並列化する
+COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+COPY_CHUNK_SIZE = 1024 * 1024
+COPY_BUFFER_SIZE = 256 * 1024
+# linux/fs.h の FICLONE（_IOW(0x94, 9, int)）。Linux以外では別のioctlを指すため使わない
+FICLONE = 0x40049409
+REFLINK_SUPPORTED = fcntl is not None and sys.platform.startswith("linux")
+
+
+def _copy_fd_loop(src_fd: int, copy_chunk: Callable[[], int]) -> bool:
+    """
+    copy_chunkを0が返るまで繰り返す
+    
+    FUSEや一部のカーネルのFS間コピーでは、何もコピーせずに最初から0を返すことがある。
+    最初の呼び出しが0なのにコピー元にまだデータが残っている場合は、その方法は使えないと
+    みなしてFalseを返す（shutilと同じ判定）
+    """
+    if copy_chunk() == 0:
+        position = os.lseek(src_fd, 0, os.SEEK_CUR)
+        return os.fstat(src_fd).st_size <= position
+    while copy_chunk() > 0:
+        pass
+    return True
+
+
+def _copy_fd_contents(src_fd: int, dst_fd: int) -> None:
+    """
+    src_fdの現在位置からEOFまでをdst_fdへコピーする
+    
+    カーネル内で完結する方法から順に試す:
+    copy_file_range（対応FSではreflink） -> sendfile -> read/write
+    どの方法も両fdのオフセットを進めるので、途中で失敗しても続きから次の方法で再開できる
+    """
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is not None:
+        try:
+            if _copy_fd_loop(src_fd, lambda: copy_file_range(src_fd, dst_fd, COPY_CHUNK_SIZE)):
+                return
+        except OSError:
+            pass
+    
+    sendfile = getattr(os, "sendfile", None)
+    if sendfile is not None:
+        try:
+            if _copy_fd_loop(src_fd, lambda: sendfile(dst_fd, src_fd, None, COPY_CHUNK_SIZE)):
+                return
+        except OSError:
+            pass
+    
+    buffer = bytearray(COPY_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(src_fd, "rb", buffering=0, closefd=False) as src:
+        while True:
+            read = src.readinto(buffer)
+            if not read:
+                break
+            written = 0
+            while written < read:
+                written += os.write(dst_fd, view[written:read])
+
+
+def _try_reflink(src_fd: int, dst_fd: int) -> bool:
+    """
+    FICLONEでコピー先をコピー元のCoWクローンにする（btrfs/XFS等の同一FSのみ）
+    
+    データを一切コピーしないため、対応していない環境ではFalseを返して通常のコピーに任せる
+    """
+    if not REFLINK_SUPPORTED:
+        return False
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except OSError:
+        # EXDEV（別FS）, EOPNOTSUPP/EINVAL/ENOTTY（非対応FS）など
+        return False
+
+
+def _fast_copy(source: Path, target: Path) -> None:
+    """
+    shutil.copy2相当のコピー（内容とメタデータ）
+    
+    同一FS上ならreflinkでクローンし、それ以外はユーザー空間のバッファを経由しない方法を優先してコピーし、
+    mtime等のメタデータはshutil.copystatで引き継ぐ
+    """
+    src_fd = os.open(source, os.O_RDONLY)
+    try:
+        dst_fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            if not _try_reflink(src_fd, dst_fd):
+                _copy_fd_contents(src_fd, dst_fd)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    shutil.copystat(source, target)
+
+
+def _needs_copy(source: Path, target: Path) -> bool:
+    """
+    コピーが必要かどうかを判定する
+    
+    コピー先が存在しサイズも同じ場合は内容を比較して判定する。
+    git checkout/pullはファイルのmtimeを現在時刻にするため、mtimeでは判定しない
+    """
+    try:
+        target_stat = target.stat()
+    except FileNotFoundError:
+        return True
+    source_stat = source.stat()
+    if source_stat.st_size != target_stat.st_size:
+        return True
+    return not filecmp.cmp(source, target, shallow=False)
+
+
+def _copy_one(source: Path, target: Path) -> Tuple[Path, Path]:
+    _fast_copy(source, target)
+    return source, target
+
+
+def _copy_files(pairs: List[Tuple[Path, Path]]) -> List[Tuple[Path, Path]]:
+    """
+    (source, target) のペアをスレッドプールで並列にコピーする
+    
+    コピー先が既に最新のファイルはスキップする。
+    コピー先の親ディレクトリは呼び出し側で作成しておくこと
+    
+    Returns:
+        実際にコピーされたファイルのリスト（pairsと同じ順序）
+    """
+    # 同じコピー先への複数ジョブが並列に書き込むと内容が混ざるため、逐次コピー時と
+    # 同じく最後のソースだけを残す（例: 月をまたぐ週の寮食JSONは複数ラベルから出力される）
+    sources_by_target: Dict[Path, Path] = {}
+    for source, target in pairs:
+        sources_by_target[target] = source
+    if len(sources_by_target) != len(pairs):
+        logger.debug("コピー先が重複するファイルを除外: %d件", len(pairs) - len(sources_by_target))
+    unique_pairs = [(source, target) for target, source in sources_by_target.items()]
+    
+    pending = [pair for pair in unique_pairs if _needs_copy(*pair)]
+    if len(pending) != len(unique_pairs):
+        logger.debug("変更のないファイルのコピーをスキップ: %d件", len(unique_pairs) - len(pending))
+    if not pending:
+        return []
+    with ThreadPoolExecutor(max_workers=min(COPY_WORKERS, len(pending))) as executor:
+        return list(executor.map(lambda pair: _copy_one(*pair), pending))
+
+
+def _is_visible_file_name(name: str, suffix: str = "") -> bool:
+    return not name.startswith(".") and name.endswith(suffix)
+
+
+def _list_files(directory: Path, suffix: str = "") -> List[Path]:
+    """
+    os.scandirのdirent情報を使い、追加のstatなしで直下の通常ファイルを列挙する
+    
+    globと同じく隠しファイル（.DS_Store や ._x.json 等）は対象外とする
+    """
+    with os.scandir(directory) as it:
+        return [
+            Path(entry.path)
+            for entry in it
+            if _is_visible_file_name(entry.name, suffix) and entry.is_file(follow_symlinks=False)
+        ]
+
+
+def _iter_subdirs(directory: Path) -> Iterator[Path]:
+    """os.scandirのd_typeを使い、statなしで直下のディレクトリを順に返す"""
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield Path(entry.path)
+
 
 def copy_final_files(source_dir: Path, target_dir: Path) -> List[Tuple[Path, Path]]:
     """
@@ -35,19 +216,27 @@ def copy_final_files(source_dir: Path, target_dir: Path) -> List[Tuple[Path, Pat
     
     target_dir.mkdir(parents=True, exist_ok=True)
     
-    # final/内のすべてのディレクトリとファイルをコピー
-    cohort_dirs = [d for d in final_dir.iterdir() if d.is_dir()]
-    logger.debug(f"コピー対象のcohortディレクトリ数: {len(cohort_dirs)}")
-    for cohort_dir in cohort_dirs:
+    # 1. 走査: final/内のすべてのcohortのJSONをコピー計画にまとめる
+    pairs: List[Tuple[Path, Path]] = []
+    target_cohort_dirs: List[Path] = []
+    for cohort_dir in _iter_subdirs(final_dir):
+        json_files = _list_files(cohort_dir, ".json")
+        if not json_files:
+            continue
         target_cohort_dir = target_dir / cohort_dir.name
-        target_cohort_dir.mkdir(parents=True, exist_ok=True)
-        
-        json_files = list(cohort_dir.glob("*.json"))
-        logger.debug(f"{cohort_dir.name}: {len(json_files)}ファイルをコピー中...")
-        for json_file in json_files:
-            target_file = target_cohort_dir / json_file.name
-            shutil.copy2(json_file, target_file)
-            copied_files.append((json_file, target_file))
+        target_cohort_dirs.append(target_cohort_dir)
+        logger.debug("%s: %dファイルをコピー中...", cohort_dir.name, len(json_files))
+        pairs.extend((json_file, target_cohort_dir / json_file.name) for json_file in json_files)
+    
+    # 2. コピー先ディレクトリをまとめて作成（親は作成済みなので存在確認のstatを省く）
+    for target_cohort_dir in target_cohort_dirs:
+        try:
+            os.mkdir(target_cohort_dir)
+        except FileExistsError:
+            pass
+    
+    # 3. 実行: 計画したコピーを一度にスレッドプールへ流す
+    copied_files = _copy_files(pairs)
     
     logger.info(f"授業データファイルコピー完了: {len(copied_files)}ファイル")
     return copied_files
@@ -65,39 +254,30 @@ def copy_meals_files(source_dir: Path, target_dir: Path) -> List[Tuple[Path, Pat
         コピーされたファイルのリスト（(source, target)のタプル）
     """
     logger.info(f"寮食データファイルをコピー中: {source_dir} -> {target_dir}")
-    copied_files = []
     target_dir.mkdir(parents=True, exist_ok=True)
     
     # source_dir（例: meals_output）配下の各サブディレクトリにある meals/*.json を再帰的にコピー
     # 想定構造: {source_dir}/{label}/meals/*.json
-    found_any = False
-    for label_dir in source_dir.iterdir() if source_dir.exists() else []:
-        if not label_dir.is_dir():
-            continue
+    pairs: List[Tuple[Path, Path]] = []
+    for label_dir in _iter_subdirs(source_dir) if source_dir.exists() else ():
         meals_dir = label_dir / "meals"
         if not meals_dir.exists():
-            logger.debug(f"meals/ディレクトリが見つかりません: {meals_dir}")
+            logger.debug("meals/ディレクトリが見つかりません: %s", meals_dir)
             continue
-        json_files = list(meals_dir.glob("*.json"))
-        logger.debug(f"{label_dir.name}: コピー対象のJSONファイル数: {len(json_files)}")
-        for json_file in json_files:
-            target_file = target_dir / json_file.name
-            shutil.copy2(json_file, target_file)
-            copied_files.append((json_file, target_file))
-            found_any = True
-    
-    if not found_any:
+        json_files = _list_files(meals_dir, ".json")
+        logger.debug("%s: コピー対象のJSONファイル数: %d", label_dir.name, len(json_files))
+        pairs.extend((json_file, target_dir / json_file.name) for json_file in json_files)
+    
+    if not pairs:
         # 旧構造: source_dir/meals/*.json にも一応対応
         fallback_meals_dir = source_dir / "meals"
         if fallback_meals_dir.exists():
-            json_files = list(fallback_meals_dir.glob("*.json"))
-            logger.debug(f"fallback構造: コピー対象のJSONファイル数: {len(json_files)}")
-            for json_file in json_files:
-                target_file = target_dir / json_file.name
-                shutil.copy2(json_file, target_file)
-                copied_files.append((json_file, target_file))
+            json_files = _list_files(fallback_meals_dir, ".json")
+            logger.debug("fallback構造: コピー対象のJSONファイル数: %d", len(json_files))
+            pairs.extend((json_file, target_dir / json_file.name) for json_file in json_files)
         else:
             logger.warning(f"meals/ディレクトリが存在しません: {fallback_meals_dir}")
+    copied_files = _copy_files(pairs)
     
     logger.info(f"寮食データファイルコピー完了: {len(copied_files)}ファイル")
     return copied_files
@@ -116,17 +296,32 @@ def copy_dormitory_events_files(source_dir: Path, target_dir: Path) -> List[Tupl
         return copied_files
 
     target_dir.mkdir(parents=True, exist_ok=True)
-    json_files = list(events_dir.glob("*.json"))
-    logger.debug(f"コピー対象のJSONファイル数: {len(json_files)}")
-    for json_file in json_files:
-        target_file = target_dir / json_file.name
-        shutil.copy2(json_file, target_file)
-        copied_files.append((json_file, target_file))
+    json_files = _list_files(events_dir, ".json")
+    logger.debug("コピー対象のJSONファイル数: %d", len(json_files))
+    copied_files = _copy_files([(json_file, target_dir / json_file.name) for json_file in json_files])
 
     logger.info(f"寮行事データファイルコピー完了: {len(copied_files)}ファイル")
     return copied_files
 
 
+def _write_json_atomic(target_file: Path, data: object) -> None:
+    """
+    一時ファイルに書き出してからos.replaceで置き換える
+    
+    書き込み途中で中断されても、既存のファイルが壊れた状態で残らないようにする
+    """
+    temp_file = target_file.with_suffix(target_file.suffix + ".tmp")
+    try:
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, target_file)
+    except BaseException:
+        temp_file.unlink(missing_ok=True)
+        raise
+
+
 def load_processed_hashes(server_repo_path: Path, target_name: Literal["meals", "classes", "school_rules"]) -> Set[str]:
     """
     サーバーリポジトリから処理済みハッシュを読み込む
@@ -141,18 +336,17 @@ def load_processed_hashes(server_repo_path: Path, target_name: Literal["meals",
     hash_file = server_repo_path / "v1" / "sources" / "list" / f"{target_name}.json"
     
     if not hash_file.exists():
-        logger.debug(f"処理済みハッシュファイルが存在しません: {hash_file}")
+        logger.debug("処理済みハッシュファイルが存在しません: %s", hash_file)
         return set()
     
     try:
-        with open(hash_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            processed = data.get("processed", [])
-            if not isinstance(processed, list):
-                logger.warning(f"処理済みハッシュの形式が不正です: {hash_file}")
-                return set()
-            logger.debug(f"処理済みハッシュを読み込みました: {target_name} ({len(processed)}件)")
-            return set(processed)
+        data = json.loads(hash_file.read_bytes())
+        processed = data.get("processed", [])
+        if not isinstance(processed, list):
+            logger.warning(f"処理済みハッシュの形式が不正です: {hash_file}")
+            return set()
+        logger.debug("処理済みハッシュを読み込みました: %s (%d件)", target_name, len(processed))
+        return set(processed)
     except json.JSONDecodeError as e:
         logger.warning(f"処理済みハッシュファイルのJSON解析に失敗しました: {hash_file}, エラー: {e}")
         return set()
@@ -164,7 +358,7 @@ def load_processed_hashes(server_repo_path: Path, target_name: Literal["meals",
 def load_dormitory_events_state(server_repo_path: Path) -> Dict[str, Optional[str]]:
     state_file = server_repo_path / "v1" / "sources" / "list" / "dormitory_events.json"
     if not state_file.exists():
-        logger.debug(f"寮行事状態ファイルが存在しません: {state_file}")
+        logger.debug("寮行事状態ファイルが存在しません: %s", state_file)
         return {}
     try:
         with open(state_file, "r", encoding="utf-8") as f:
@@ -200,17 +394,16 @@ def merge_and_write_processed_hashes(
         更新されたファイルパス（変更がなかった場合はNone）
     """
     if not source_hash_file.exists():
-        logger.debug(f"ソースハッシュファイルが存在しません: {source_hash_file}")
+        logger.debug("ソースハッシュファイルが存在しません: %s", source_hash_file)
         return None
     
     # ソースファイルを読み込む
     try:
-        with open(source_hash_file, "r", encoding="utf-8") as f:
-            source_data = json.load(f)
-            source_hashes = source_data.get("processed", [])
-            if not isinstance(source_hashes, list):
-                logger.warning(f"ソースハッシュファイルの形式が不正です: {source_hash_file}")
-                return None
+        source_data = json.loads(source_hash_file.read_bytes())
+        source_hashes = source_data.get("processed", [])
+        if not isinstance(source_hashes, list):
+            logger.warning(f"ソースハッシュファイルの形式が不正です: {source_hash_file}")
+            return None
     except json.JSONDecodeError as e:
         logger.warning(f"ソースハッシュファイルのJSON解析に失敗しました: {source_hash_file}, エラー: {e}")
         return None
@@ -219,39 +412,45 @@ def merge_and_write_processed_hashes(
         return None
     
     if not source_hashes:
-        logger.debug(f"ソースハッシュファイルにハッシュが含まれていません: {source_hash_file}")
+        logger.debug("ソースハッシュファイルにハッシュが含まれていません: %s", source_hash_file)
         return None
     
     # サーバー側ファイルを読み込む
     target_file = server_repo_path / "v1" / "sources" / "list" / f"{target_name}.json"
-    existing_hashes = set()
+    existing_list: List[str] = []
     
     if target_file.exists():
         try:
-            with open(target_file, "r", encoding="utf-8") as f:
-                existing_data = json.load(f)
-                existing_hashes = set(existing_data.get("processed", []))
+            existing_data = json.loads(target_file.read_bytes())
+            existing_list = list(existing_data.get("processed", []))
         except (json.JSONDecodeError, Exception) as e:
             logger.warning(f"サーバー側ハッシュファイルの読み込みに失敗しました: {target_file}, エラー: {e}")
-            existing_hashes = set()
+            existing_list = []
+    existing_hashes = set(existing_list)
     
-    # マージ（重複除去）
-    merged_hashes = existing_hashes | set(source_hashes)
+    # 新規分のみ抽出（重複除去）
+    added_hashes = sorted(set(source_hashes).difference(existing_hashes))
     
     # 変更がない場合はスキップ
-    if merged_hashes == existing_hashes:
-        logger.debug(f"ハッシュに変更がありません: {target_name}")
+    if not added_hashes:
+        logger.debug("ハッシュに変更がありません: %s", target_name)
         return None
     
+    # 既存リストは常にソート済みで書き出しているため、新規分を末尾に足してsortすれば
+    # timsortが2つの昇順ランをO(n)でマージする（重複を含む古いファイルのみ作り直す）
+    if len(existing_list) != len(existing_hashes):
+        existing_list = list(existing_hashes)
+    merged_list = existing_list + added_hashes
+    merged_list.sort()
+    
     # ディレクトリを作成
     target_file.parent.mkdir(parents=True, exist_ok=True)
     
     # 書き込み
-    output_data = {"processed": sorted(list(merged_hashes))}
+    output_data = {"processed": merged_list}
     try:
-        with open(target_file, "w", encoding="utf-8") as f:
-            json.dump(output_data, f, ensure_ascii=False, indent=2)
-        logger.info(f"処理済みハッシュを更新しました: {target_name} ({len(existing_hashes)}件 -> {len(merged_hashes)}件)")
+        _write_json_atomic(target_file, output_data)
+        logger.info(f"処理済みハッシュを更新しました: {target_name} ({len(existing_hashes)}件 -> {len(merged_list)}件)")
         return target_file
     except Exception as e:
         logger.error(f"処理済みハッシュファイルの書き込みに失敗しました: {target_file}, エラー: {e}")
@@ -263,7 +462,7 @@ def merge_and_write_dormitory_events_state(
     server_repo_path: Path,
 ) -> Optional[Path]:
     if not source_state_file.exists():
-        logger.debug(f"ソース状態ファイルが存在しません: {source_state_file}")
+        logger.debug("ソース状態ファイルが存在しません: %s", source_state_file)
         return None
     try:
         with open(source_state_file, "r", encoding="utf-8") as f:
@@ -290,8 +489,7 @@ def merge_and_write_dormitory_events_state(
 
     target_file.parent.mkdir(parents=True, exist_ok=True)
     try:
-        with open(target_file, "w", encoding="utf-8") as f:
-            json.dump(source_data, f, ensure_ascii=False, indent=2)
+        _write_json_atomic(target_file, source_data)
         logger.info("寮行事状態ファイルを更新しました")
         return target_file
     except Exception as e:
@@ -303,16 +501,16 @@ def _extract_rule_ids_from_index(index_path: Path) -> Set[str]:
     if not index_path.exists():
         return set()
     try:
-        data = json.loads(index_path.read_text(encoding="utf-8"))
+        data = json.loads(index_path.read_bytes())
     except Exception:
         return set()
-    rules = data.get("rules") or []
-    rule_ids: Set[str] = set()
-    for rule in rules:
-        rule_id = rule.get("id")
-        if isinstance(rule_id, str):
-            rule_ids.add(rule_id)
-    return rule_ids
+    if not isinstance(data, dict):
+        return set()
+    return {
+        rule_id
+        for rule in data.get("rules") or []
+        if isinstance(rule, dict) and isinstance(rule_id := rule.get("id"), str)
+    }
 
 
 def _remove_rule_files(target_rules_dir: Path, rule_ids: Set[str]) -> int:
@@ -326,22 +524,18 @@ def _remove_rule_files(target_rules_dir: Path, rule_ids: Set[str]) -> int:
 
 
 def _remove_rule_figures(target_figures_dir: Path, rule_ids: Set[str]) -> int:
-    if not target_figures_dir.exists():
+    if not rule_ids or not target_figures_dir.exists():
         return 0
     removed = 0
-    for file_path in target_figures_dir.iterdir():
-        if not file_path.is_file():
-            continue
-        name = file_path.name
-        if not name.startswith("rule-"):
-            continue
-        parts = name.split("_")
-        if not parts:
-            continue
-        rule_prefix = parts[0]
-        if rule_prefix in rule_ids:
-            file_path.unlink(missing_ok=True)
-            removed += 1
+    with os.scandir(target_figures_dir) as it:
+        for entry in it:
+            name = entry.name
+            if not name.startswith("rule-") or not entry.is_file(follow_symlinks=False):
+                continue
+            rule_prefix = name.partition("_")[0]
+            if rule_prefix in rule_ids:
+                os.unlink(entry.path)
+                removed += 1
     return removed
 
 
@@ -371,10 +565,12 @@ def copy_school_rules_files(source_dir: Path, target_dir: Path) -> Dict[str, int
     target_rule_ids = _extract_rule_ids_from_index(target_index_path)
     source_rule_ids = _extract_rule_ids_from_index(source_index)
 
-    if source_index.exists():
-        shutil.copy2(source_index, target_dir / "index.json")
-    if source_chapters.exists():
-        shutil.copy2(source_chapters, target_dir / "chapters.json")
+    metadata_pairs = [
+        (source_path, target_dir / source_path.name)
+        for source_path in (source_index, source_chapters)
+        if source_path.exists()
+    ]
+    _copy_files(metadata_pairs)
 
     removed_rule_ids: Set[str] = set()
     regenerated_rule_ids: Set[str] = set()
@@ -392,22 +588,21 @@ def copy_school_rules_files(source_dir: Path, target_dir: Path) -> Dict[str, int
 
     if removed_rule_ids:
         result["rules_removed"] = _remove_rule_files(target_rules_dir, removed_rule_ids)
-        result["figures_removed"] += _remove_rule_figures(target_figures_dir, removed_rule_ids)
 
-    if regenerated_rule_ids:
-        result["figures_removed"] += _remove_rule_figures(target_figures_dir, regenerated_rule_ids)
+    # 削除分と再生成分の図は一度の走査でまとめて消す
+    result["figures_removed"] = _remove_rule_figures(target_figures_dir, removed_rule_ids | regenerated_rule_ids)
 
     if source_rules_dir.exists():
-        for rule_file in source_rules_dir.glob("*.json"):
-            target_file = target_rules_dir / rule_file.name
-            shutil.copy2(rule_file, target_file)
-            result["rules_copied"] += 1
+        rule_pairs = [(rule_file, target_rules_dir / rule_file.name) for rule_file in _list_files(source_rules_dir, ".json")]
+        result["rules_copied"] = len(_copy_files(rule_pairs))
 
     if source_figures_dir.exists():
-        for fig_file in source_figures_dir.glob("*.*"):
-            target_file = target_figures_dir / fig_file.name
-            shutil.copy2(fig_file, target_file)
-            result["figures_copied"] += 1
+        figure_pairs = [
+            (fig_file, target_figures_dir / fig_file.name)
+            for fig_file in _list_files(source_figures_dir)
+            if "." in fig_file.name
+        ]
+        result["figures_copied"] = len(_copy_files(figure_pairs))
 
     logger.info(
         "学校規則コピー完了: rules=%s, figures=%s, removed_rules=%s, removed_figures=%s",
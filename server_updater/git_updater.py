@@ -5,13 +5,55 @@ Git操作
 WakayamaServerリポジトリへのコミット＆プッシュ
 """
 
+import base64
 import logging
+import os
 import subprocess
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# 失敗時の例外にエラーメッセージを残すため、stderrだけはパイプで受け取る
+_QUIET = {"stderr": subprocess.PIPE}
+
+
+@lru_cache(maxsize=8)
+def _auth_config_args(repo_url: str, github_token: str) -> Tuple[str, ...]:
+    """
+    GitHubへの認証ヘッダーを1コマンド限りで渡すための ``-c`` 引数を返す
+    
+    トークンをリモートURLに埋め込むと .git/config に平文で保存されるため、
+    http.extraheader でリクエストごとに付与する（actions/checkoutと同じ形式）
+    """
+    if not github_token or "github.com" not in repo_url or "@" in repo_url:
+        return ()
+    credentials = base64.b64encode(f"x-access-token:{github_token}".encode("utf-8")).decode("ascii")
+    return ("-c", f"http.extraheader=AUTHORIZATION: basic {credentials}")
+
+
+def _run_git(
+    repo_path: Path,
+    args: List[str],
+    check: bool = True,
+    input: Optional[bytes] = None,
+    capture_stdout: bool = False,
+) -> subprocess.CompletedProcess:
+    """
+    ``git -C <repo_path>`` としてgitを実行する
+    
+    プロセスのカレントディレクトリに依存しないため、別スレッドから並行して呼び出せる。
+    標準出力は使う場合（capture_stdout=True）のみ受け取り、それ以外は捨てる
+    """
+    return subprocess.run(
+        ["git", "-C", str(repo_path), *args],
+        check=check,
+        input=input,
+        stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+        **_QUIET,
+    )
+
 
 def init_git_repo(repo_path: Path, github_token: str, repo_url: str, branch: str = "main") -> bool:
     """
@@ -29,33 +71,37 @@ def init_git_repo(repo_path: Path, github_token: str, repo_url: str, branch: str
     repo_path = repo_path.resolve()
     logger.info(f"Gitリポジトリを初期化中: repo_path={repo_path}, branch={branch}")
     try:
-        # リポジトリURLにトークンを埋め込む
-        if "github.com" in repo_url and "@" not in repo_url:
-            # https://github.com/user/repo.git -> https://TOKEN@github.com/user/repo.git
-            url_parts = repo_url.replace("https://", "").split("/")
-            auth_url = f"https://{github_token}@{'/'.join(url_parts)}"
-        else:
-            auth_url = repo_url
+        auth_args = _auth_config_args(repo_url, github_token)
         
         if not repo_path.exists() or not (repo_path / ".git").exists():
             # クローン
             logger.info(f"リポジトリをクローン中: {repo_url}")
             repo_path.parent.mkdir(parents=True, exist_ok=True)
-            subprocess.run(
-                ["git", "clone", "-b", branch, auth_url, str(repo_path)],
-                check=True,
-                capture_output=True,
-            )
+            try:
+                # 書き込みに必要なのは最新のツリーだけなので、履歴は取得しない
+                subprocess.run(
+                    ["git", *auth_args, "clone", "--depth=1", "--single-branch", "-b", branch, repo_url, str(repo_path)],
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    **_QUIET,
+                )
+            except subprocess.CalledProcessError as e:
+                logger.warning(f"シャロークローンに失敗したため、通常のクローンを試みます (終了コード: {e.returncode})")
+                subprocess.run(
+                    ["git", *auth_args, "clone", "-b", branch, repo_url, str(repo_path)],
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    **_QUIET,
+                )
             logger.info("リポジトリのクローンが完了しました")
         else:
             # プル
             logger.info("既存リポジトリを更新中...")
-            logger.debug("git fetchを実行中...")
-            subprocess.run(["git", "fetch"], check=True, capture_output=True, cwd=str(repo_path))
-            logger.debug(f"ブランチ {branch} に切り替え中...")
-            subprocess.run(["git", "checkout", branch], check=True, capture_output=True, cwd=str(repo_path))
+            # fetchとpullを分けず、対象ブランチだけを早送りで取り込む
+            logger.debug("ブランチ %s に切り替え中...", branch)
+            _run_git(repo_path, ["checkout", branch])
             logger.debug("git pullを実行中...")
-            subprocess.run(["git", "pull"], check=True, capture_output=True, cwd=str(repo_path))
+            _run_git(repo_path, [*auth_args, "pull", "--ff-only", "--no-tags", "origin", branch])
             logger.info("リポジトリの更新が完了しました")
         
         return True
@@ -88,27 +134,24 @@ def commit_and_push(
     """
     repo_path = repo_path.resolve()
     logger.info(f"Gitコミット・プッシュを開始: branch={branch}")
-    logger.debug(f"コミットメッセージ: {commit_message}")
+    logger.debug("コミットメッセージ: %s", commit_message)
     try:
+        # 作業ツリーに変更が一切なければ、add/diff/commitを起動せずに終了する
+        status = _run_git(repo_path, ["status", "--porcelain=v1", "-z"], capture_stdout=True)
+        if not status.stdout:
+            logger.info("変更がありません。コミットをスキップします。")
+            return True
+        
         # ユーザー設定
         logger.debug("Gitユーザー設定中...")
-        subprocess.run(
-            ["git", "config", "user.name", "GitHub Actions"],
-            check=True,
-            capture_output=True,
-            cwd=str(repo_path),
-        )
-        subprocess.run(
-            ["git", "config", "user.email", "actions@github.com"],
-            check=True,
-            capture_output=True,
-            cwd=str(repo_path),
-        )
+        _run_git(repo_path, ["config", "user.name", "GitHub Actions"])
+        _run_git(repo_path, ["config", "user.email", "actions@github.com"])
         
         # 変更をステージング
         logger.debug("変更をステージング中...")
         if files:
-            logger.debug(f"指定ファイルのみステージング: {len(files)}ファイル")
+            logger.debug("指定ファイルのみステージング: %dファイル", len(files))
+            pathspecs = []
             for file_path in files:
                 path_obj = Path(file_path)
                 if path_obj.exists():
@@ -116,59 +159,41 @@ def commit_and_push(
                         relative_path = path_obj.resolve().relative_to(repo_path)
                     except ValueError:
                         relative_path = path_obj.resolve()
-                    subprocess.run(
-                        ["git", "add", str(relative_path)],
-                        check=True,
-                        capture_output=True,
-                        cwd=str(repo_path),
-                    )
+                    pathspecs.append(os.fsencode(relative_path))
+            # ファイルごとにgitを起動せず、NUL区切りのパス一覧を標準入力で渡して一度で追加する
+            if pathspecs:
+                _run_git(
+                    repo_path,
+                    ["add", "--pathspec-from-file=-", "--pathspec-file-nul"],
+                    input=b"\0".join(pathspecs),
+                )
         else:
             logger.debug("すべての変更をステージング")
-            subprocess.run(["git", "add", "."], check=True, capture_output=True, cwd=str(repo_path))
+            _run_git(repo_path, ["add", "."])
         
         # 変更があるかチェック
         logger.debug("変更の有無を確認中...")
-        result = subprocess.run(
-            ["git", "diff", "--cached", "--quiet"],
-            capture_output=True,
-            cwd=str(repo_path),
-        )
+        result = _run_git(repo_path, ["diff", "--cached", "--quiet"], check=False)
         if result.returncode == 0:
             logger.info("変更がありません。コミットをスキップします。")
             return True
         
         # コミット
         logger.info("コミットを実行中...")
-        subprocess.run(
-            ["git", "commit", "-m", commit_message],
-            check=True,
-            capture_output=True,
-            cwd=str(repo_path),
-        )
+        _run_git(repo_path, ["commit", "-m", commit_message])
         logger.info("コミットが完了しました")
         
         # プッシュ
         logger.info("プッシュを実行中...")
-        # リポジトリURLにトークンを埋め込む
-        if "github.com" in repo_url and "@" not in repo_url:
-            url_parts = repo_url.replace("https://", "").split("/")
-            auth_url = f"https://{github_token}@{'/'.join(url_parts)}"
-        else:
-            auth_url = repo_url
-        
-        # リモートURLを設定
-        subprocess.run(
-            ["git", "remote", "set-url", "origin", auth_url],
-            check=True,
-            capture_output=True,
-            cwd=str(repo_path),
-        )
-        
-        subprocess.run(
-            ["git", "push", "origin", branch],
-            check=True,
-            capture_output=True,
-            cwd=str(repo_path),
+        # 小さなJSONが大半のため、圧縮レベルを下げてpack作成を全コアで行う
+        _run_git(
+            repo_path,
+            [
+                *_auth_config_args(repo_url, github_token),
+                "-c", "pack.compression=1",
+                "-c", "pack.threads=0",
+                "push", "origin", branch,
+            ],
         )
         logger.info("プッシュが完了しました")
         